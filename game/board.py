@@ -4,29 +4,18 @@ import logging
 from dataclasses import dataclass
 from enum import Enum
 
-import numpy as np
 import pygame as pg
-from numpy.typing import NDArray
 
 BLACK_RGB = (0, 0, 0)
 WHITE_RGB = (255, 255, 255)
 GREEN_RGB = (0, 140, 0)
 
-logger = logging.getLogger(__name__)
-
+# Bit masks for a bitboard where square (row, column) is bit row * 8 + column.
+FULL_BOARD = 0xFFFFFFFFFFFFFFFF
+NOT_LEFT_COLUMN = 0xFEFEFEFEFEFEFEFE  # all squares except column 0
+NOT_RIGHT_COLUMN = 0x7F7F7F7F7F7F7F7F  # all squares except column 7
 
-@dataclass(init=False)
-class Position:
-    row: int  # row index on the board from 0 to Board.SIZE - 1
-    column: int  # column index on the board from 0 to Board.SIZE - 1
-
-    def __init__(self, row: int, column: int) -> None:
-        assert row >= 0 and row < Board.SIZE, f"Row index {row} is out of range."
-        assert (
-            column >= 0 and column < Board.SIZE
-        ), f"Column index {column} is out of range."
-        self.row = row
-        self.column = column
+logger = logging.getLogger(__name__)
 
 
 class Player(Enum):
@@ -43,23 +32,113 @@ class Player(Enum):
 
     @property
     def other(self) -> "Player":
-        return Player.BLACK if self == Player.WHITE else Player.WHITE
-
-    @property
-    def other_id(self) -> int:
-        return self.other.id
+        return Player.BLACK if self is Player.WHITE else Player.WHITE
 
     def __str__(self) -> str:
         return self.name.lower()
 
-    @classmethod
-    def from_id(cls, id: np.byte) -> "Player":
-        if id == cls.BLACK.id:
-            return cls.BLACK
-        elif id == cls.WHITE.id:
-            return cls.WHITE
-        else:
-            raise RuntimeError("Invalid id %d.", id)
+
+# (row, column) step of each of the eight directions
+DIRECTIONS: tuple[tuple[int, int], ...] = (
+    (0, -1),
+    (0, 1),
+    (-1, 0),
+    (1, 0),
+    (-1, 1),
+    (-1, -1),
+    (1, 1),
+    (1, -1),
+)
+
+# (bit offset, mask of squares that stay on the board) per direction
+SHIFTS: tuple[tuple[int, int], ...] = tuple(
+    (
+        row_step * 8 + column_step,
+        {-1: NOT_LEFT_COLUMN, 0: FULL_BOARD, 1: NOT_RIGHT_COLUMN}[column_step],
+    )
+    for row_step, column_step in DIRECTIONS
+)
+
+
+def _shift(bb: int, offset: int, mask: int) -> int:
+    """Returns bitboard with every stone moved one square by offset."""
+    bb &= mask
+    return (bb << offset) & FULL_BOARD if offset > 0 else bb >> -offset
+
+
+def _ray(move: int, offset: int, mask: int) -> tuple[int, ...]:
+    """Returns the squares from move outward to the edge in direction of offset."""
+    squares = []
+    square = _shift(move, offset, mask)
+    while square:
+        squares.append(square)
+        square = _shift(square, offset, mask)
+    return tuple(squares)
+
+
+# RAYS[square] holds one ray per direction of DIRECTIONS, indexed by bit position.
+RAYS: tuple[tuple[tuple[int, ...], ...], ...] = tuple(
+    tuple(_ray(1 << square, offset, mask) for offset, mask in SHIFTS)
+    for square in range(FULL_BOARD.bit_length())
+)
+
+# NEIGHBOURS[square] is the bitboard of all squares adjacent to square.
+NEIGHBOURS: tuple[int, ...] = tuple(sum(ray[0] for ray in rays if ray) for rays in RAYS)
+
+
+@dataclass(frozen=True)
+class BitBoard:
+    """Stones of both players, one bit per square."""
+
+    black: int
+    white: int
+
+    def get(self, player: Player) -> int:
+        """Returns the bitboard of the given player."""
+        return self.black if player is Player.BLACK else self.white
+
+    def play(self, player: Player, move: int, flips: int) -> "BitBoard":
+        """
+        Returns the board after player places the move stone and flips the given stones.
+
+        Playing the same move on the resulting board undoes it again.
+        """
+        black = self.black ^ flips
+        white = self.white ^ flips
+        if player is Player.BLACK:
+            return BitBoard(black=black ^ move, white=white)
+        return BitBoard(black=black, white=white ^ move)
+
+
+def _stones_to_flip(own: int, opp: int, square: int) -> int:
+    """Returns bitboard of opponent stones to flip if own player plays on square."""
+    if not NEIGHBOURS[square] & opp:
+        return 0
+    flips = 0
+    for ray in RAYS[square]:
+        # walk the ray only up to the first square not held by the opponent
+        captured = 0
+        for bit in ray:
+            if bit & opp:
+                captured |= bit
+            else:
+                if bit & own:
+                    flips |= captured
+                break
+    return flips
+
+
+def _legal_moves(own: int, opp: int) -> int:
+    """Returns bitboard of all empty squares where own player may place a stone."""
+    empty = ~(own | opp) & FULL_BOARD
+    legal = 0
+    for offset, mask in SHIFTS:
+        # opponent runs starting next to an own stone; at most SIZE - 2 long
+        captured = _shift(own, offset, mask) & opp
+        for _ in range(Board.SIZE - 3):
+            captured |= _shift(captured, offset, mask) & opp
+        legal |= _shift(captured, offset, mask) & empty
+    return legal
 
 
 class Board:
@@ -69,251 +148,116 @@ class Board:
     SQUARE_SIZE = 100
     CIRCLE_RADIUS = 30
     SIZE = 8
+    # white on (3, 3) and (4, 4), black on (3, 4) and (4, 3)
+    INITIAL_BOARD = BitBoard(black=0x0000000810000000, white=0x0000001008000000)
 
     def __init__(self, player: Player = Player.BLACK):
         length = Board.SIZE * Board.SQUARE_SIZE
         self.screen = pg.display.set_mode((length, length))
-        self.board: NDArray[np.byte] = np.zeros((Board.SIZE, Board.SIZE), dtype=np.byte)
-        self.player: Player = player
-        mid_point = Board.SIZE // 2 - 1
-        self.board[mid_point, mid_point] = Player.WHITE.id
-        self.board[mid_point, mid_point + 1] = Player.BLACK.id
-        self.board[mid_point + 1, mid_point] = Player.BLACK.id
-        self.board[mid_point + 1, mid_point + 1] = Player.WHITE.id
-        self.previous_board: NDArray[np.byte] = self.board
-        self.getters = [
-            self._get_left_stones_to_flip,
-            self._get_right_stones_to_flip,
-            self._get_top_stones_to_flip,
-            self._get_bottom_stones_to_flip,
-            self._get_top_right_stones_to_flip,
-            self._get_top_left_stones_to_flip,
-            self._get_bottom_right_stones_to_flip,
-            self._get_bottom_left_stones_to_flip,
+        self.background = self.screen.copy()
+        self.background.fill(GREEN_RGB)
+        # draw lines
+        for i in range(Board.SIZE + 1):
+            h_start = (0, i * Board.SQUARE_SIZE)
+            h_end = (length, i * Board.SQUARE_SIZE)
+            pg.draw.line(self.background, BLACK_RGB, h_start, h_end, Board.LINE_WIDTH)
+            v_start = (i * Board.SQUARE_SIZE, 0)
+            v_end = (i * Board.SQUARE_SIZE, length)
+            pg.draw.line(self.background, BLACK_RGB, v_start, v_end, Board.LINE_WIDTH)
+        # pixel centre of every square, indexed by bit position
+        self.centers: list[tuple[float, float]] = [
+            ((column + 1 / 2) * Board.SQUARE_SIZE, (row + 1 / 2) * Board.SQUARE_SIZE)
+            for row in range(Board.SIZE)
+            for column in range(Board.SIZE)
         ]
-        self._draw()
-
-    def _get_left_stones_to_flip(self, pos: Position) -> list[Position]:
-        """Returns list of positions, left of given position, to flip if stone with given position is played by current player."""
-        result: list[Position] = []
-        row = pos.row
-        col = pos.column
-        if col > 1 and self.board[row, col - 1] == self.player.other_id:
-            for index in range(col - 2, -1, -1):
-                if self.board[row, index] == self.player.id:
-                    result.extend(
-                        Position(row=row, column=c) for c in range(index + 1, col)
-                    )
-                    break
-        return result
-
-    def _get_right_stones_to_flip(self, pos: Position) -> list[Position]:
-        """Returns list of positions, right of given position, to flip if stone with given position is played by current player."""
-        result: list[Position] = []
-        row = pos.row
-        column = pos.column
-        if (
-            column < Board.SIZE - 1
-            and self.board[row, column + 1] == self.player.other_id
-        ):
-            for index in range(column + 2, Board.SIZE):
-                if self.board[row, index] == self.player.id:
-                    result.extend(
-                        Position(row=row, column=c) for c in range(column + 1, index)
-                    )
-                    break
-        return result
-
-    def _get_top_stones_to_flip(self, pos: Position) -> list[Position]:
-        """Returns list of positions, on top of given position, to flip if stone with given position is played by current player."""
-        result: list[Position] = []
-        row = pos.row
-        column = pos.column
-        if row > 1 and self.board[row - 1, column] == self.player.other_id:
-            for index in range(row - 2, -1, -1):
-                if self.board[index, column] == self.player.id:
-                    result.extend(
-                        Position(row=r, column=column) for r in range(index + 1, row)
-                    )
-                    break
-        return result
-
-    def _get_bottom_stones_to_flip(self, pos: Position) -> list[Position]:
-        """Returns list of positions, bottom of given position, to flip if stone with given position is played by current player."""
-        result: list[Position] = []
-        row = pos.row
-        column = pos.column
-        if row < Board.SIZE - 1 and self.board[row + 1, column] == self.player.other_id:
-            for index in range(row + 2, Board.SIZE):
-                if self.board[index, column] == self.player.id:
-                    result.extend(
-                        Position(row=r, column=column) for r in range(row + 1, index)
-                    )
-                    break
-        return result
-
-    def _get_top_right_stones_to_flip(self, pos: Position) -> list[Position]:
-        """Returns list of positions, top-right of given position, to flip if stone with given position is played by current player."""
-        result: list[Position] = []
-        row = pos.row
-        column = pos.column
-        if (
-            row > 1
-            and column < Board.SIZE - 1
-            and self.board[row - 1, column + 1] == self.player.other_id
-        ):
-            for r_index, c_index in zip(
-                range(row - 2, -1, -1), range(column + 2, Board.SIZE)
-            ):
-                if self.board[r_index, c_index] == self.player.id:
-                    result.extend(
-                        Position(row=r, column=c)
-                        for r, c in zip(
-                            range(r_index + 1, row), range(column + 1, c_index)
-                        )
-                    )
-                    break
-        return result
-
-    def _get_top_left_stones_to_flip(self, pos: Position) -> list[Position]:
-        """Returns list of positions, top-left of given position, to flip if stone with given position is played by current player."""
-        result: list[Position] = []
-        row = pos.row
-        column = pos.column
-        if (
-            row > 1
-            and column > 1
-            and self.board[row - 1, column - 1] == self.player.other_id
-        ):
-            for r_index, c_index in zip(
-                range(row - 2, -1, -1), range(column - 2, -1, -1)
-            ):
-                if self.board[r_index, c_index] == self.player.id:
-                    result.extend(
-                        Position(row=r, column=c)
-                        for r, c in zip(
-                            range(r_index + 1, row), range(c_index + 1, column)
-                        )
-                    )
-                    break
-        return result
-
-    def _get_bottom_right_stones_to_flip(self, pos: Position) -> list[Position]:
-        """Returns list of positions, bottom-right of given position, to flip if stone with given position is played by current player."""
-        result: list[Position] = []
-        row = pos.row
-        column = pos.column
-        if (
-            row < Board.SIZE - 1
-            and column < Board.SIZE - 1
-            and self.board[row + 1, column + 1] == self.player.other_id
-        ):
-            for r_index, c_index in zip(
-                range(row + 2, Board.SIZE), range(column + 2, Board.SIZE)
-            ):
-                if self.board[r_index, c_index] == self.player.id:
-                    result.extend(
-                        Position(row=r, column=c)
-                        for r, c in zip(
-                            range(row + 1, r_index), range(column + 1, c_index)
-                        )
-                    )
-                    break
-        return result
-
-    def _get_bottom_left_stones_to_flip(self, pos: Position) -> list[Position]:
-        """Returns list of positions, bottom-left of given position, to flip if stone with given position is played by current player."""
-        result: list[Position] = []
-        row = pos.row
-        column = pos.column
-        if (
-            row < Board.SIZE - 1
-            and column > 1
-            and self.board[row + 1, column - 1] == self.player.other_id
-        ):
-            for r_index, c_index in zip(
-                range(row + 2, Board.SIZE), range(column - 2, -1, -1)
-            ):
-                if self.board[r_index, c_index] == self.player.id:
-                    result.extend(
-                        Position(row=r, column=c)
-                        for r, c in zip(
-                            range(row + 1, r_index), range(c_index + 1, column)
-                        )
-                    )
-                    break
-        return result
+        self.player: Player = player
+        self.board: BitBoard = Board.INITIAL_BOARD
+        # (player, move, flips) of every move played so far
+        self.history: list[tuple[Player, int, int]] = []
+        self._draw_full()
 
     def update(self, *, column: int, row: int):
         """Update the board based on the given position."""
+        square = row * Board.SIZE + column
+        move = 1 << square
         board = self.board
-        if board[row, column] != 0:
+        player = self.player
+        own = board.get(player)
+        opp = board.get(player.other)
+        if (own | opp) & move:
             logger.warning("Field already occupied.")
             return
 
-        to_flip: list[Position] = []
-        position = Position(row, column)
-
-        for get_func in self.getters:
-            to_flip.extend(get_func(position))
+        to_flip = _stones_to_flip(own, opp, square)
 
         if not to_flip:
-            logger.warning("Invalid move for %s.", self.player.name)
+            logger.warning("Invalid move for %s.", player.name)
         else:
-            self.previous_board = np.copy(board)
-            logger.debug("Flip stones %s", to_flip)
-            board[row, column] = self.player.id
-            for pos in to_flip:
-                board[pos.row, pos.column] = self.player.id
-            self._draw()
-            self.player = self.player.other
+            self.history.append((player, move, to_flip))
+            logger.debug("Flip stones %#x", to_flip)
+            self.board = board.play(player, move, to_flip)
+            pg.display.update(self._draw_stones(move | to_flip, player))
+            self.player = player.other
 
     def revert(self):
         """
         Discard the last move and go back to the previous state of the board.
         """
-        if (self.board != self.previous_board).any():
+        if self.history:
             logger.info("Reverting to previous state.")
-            self.board = self.previous_board
-            self._draw()
-            self.player = self.player.other
+            player, move, flips = self.history.pop()
+            self.board = self.board.play(player, move, flips)
+            self._draw_full()
+            self.player = player
 
     def pass_move(self) -> None:
-        for row, column in np.argwhere(self.board == 0):
-            pos = Position(row=row, column=column)
-            for get_fct in self.getters:
-                if get_fct(pos):
-                    logger.warning(
-                        "Passing is not permitted for %s as available move exists.",
-                        self.player.name,
-                    )
-                    return
-        self.player = self.player.other
+        player = self.player
+        if _legal_moves(self.board.get(player), self.board.get(player.other)):
+            logger.warning(
+                "Passing is not permitted for %s as available move exists.",
+                player.name,
+            )
+            return
+        self.player = player.other
+
+    def legal_moves(self) -> dict[tuple[int, int], int]:
+        """Returns (row, column) of every legal move of current player mapped to its number of flips."""
+        own = self.board.get(self.player)
+        opp = self.board.get(self.player.other)
+        result: dict[tuple[int, int], int] = {}
+        legal = _legal_moves(own, opp)
+        while legal:
+            move = legal & -legal
+            square = move.bit_length() - 1
+            flips = _stones_to_flip(own, opp, square)
+            result[divmod(square, Board.SIZE)] = flips.bit_count()
+            legal ^= move
+        return result
 
     def score(self, player: Player) -> int:
         """Returns the current score for the given player."""
-        return np.count_nonzero(self.board == player.id)
+        return self.board.get(player).bit_count()
 
-    def _draw(self):
-        """Draws the current pieces on the board."""
-        self.screen.fill(GREEN_RGB)
-        # draw lines
-        length = Board.SIZE * Board.SQUARE_SIZE
-        for i in range(Board.SIZE + 1):
-            h_start = (0, i * Board.SQUARE_SIZE)
-            h_end = (length, i * Board.SQUARE_SIZE)
-            pg.draw.line(self.screen, BLACK_RGB, h_start, h_end, Board.LINE_WIDTH)
-            v_start = (i * Board.SQUARE_SIZE, 0)
-            v_end = (i * Board.SQUARE_SIZE, length)
-            pg.draw.line(self.screen, BLACK_RGB, v_start, v_end, Board.LINE_WIDTH)
+    def _draw_full(self):
+        """Draws the whole board and shows it on the display."""
+        self.screen.blit(self.background, (0, 0))
         # draw stones
-        for row, column in np.argwhere(self.board != 0):
-            x_pos = (column + 1 / 2) * Board.SQUARE_SIZE
-            y_pos = (row + 1 / 2) * Board.SQUARE_SIZE
-            id = self.board[row, column]
-            pg.draw.circle(
-                self.screen,
-                Player.from_id(id).rgb,
-                (x_pos, y_pos),
-                Board.CIRCLE_RADIUS,
+        for player in Player:
+            self._draw_stones(self.board.get(player), player)
+        pg.display.flip()
+
+    def _draw_stones(self, stones: int, player: Player) -> list[pg.Rect]:
+        """Draws the given stones in colour of player and returns the touched areas."""
+        rects: list[pg.Rect] = []
+        while stones:
+            stone = stones & -stones
+            rects.append(
+                pg.draw.circle(
+                    self.screen,
+                    player.rgb,
+                    self.centers[stone.bit_length() - 1],
+                    Board.CIRCLE_RADIUS,
+                )
             )
+            stones ^= stone
+        return rects
@@ -15,36 +15,45 @@ def main():
     done = False
     board = Board()
     while not done:
-        for event in pg.event.get():
-            match event:
-                case EventType(type=pg.KEYDOWN):
-                    if event.key == pg.K_p:
-                        board.pass_move()
-                    elif event.key == pg.K_p:  # pass
-                        board.pass_move
-                    elif event.key == pg.K_q:  # quit
-                        done = True
-                    elif event.key == pg.K_r:  # revert
-                        board.revert()
-                    elif event.key == pg.K_s:  # score
+        event = pg.event.wait()
+        match event:
+            case EventType(type=pg.KEYDOWN):
+                if event.key == pg.K_h:  # hint
+                    for (row, column), flips in board.legal_moves().items():
                         logger.info(
-                            "Current score of %s: %d",
-                            Player.BLACK,
-                            board.score(Player.BLACK),
+                            "Possible move of %s on row:%d and column:%d flips %d",
+                            board.player,
+                            row,
+                            column,
+                            flips,
                         )
-                        logger.info(
-                            "Current score of %s: %d",
-                            Player.WHITE,
-                            board.score(Player.WHITE),
-                        )
-                case EventType(type=pg.QUIT):
+                elif event.key == pg.K_p:  # pass
+                    board.pass_move()
+                elif event.key == pg.K_q:  # quit
                     done = True
-                case EventType(type=pg.MOUSEBUTTONDOWN):
-                    x = pg.mouse.get_pos()[0] // Board.SQUARE_SIZE
-                    y = pg.mouse.get_pos()[1] // Board.SQUARE_SIZE
-                    logger.debug(f"{board.player} on row:{y} and column:{x}")
-                    board.update(column=x, row=y)
-        pg.display.flip()
+                elif event.key == pg.K_r:  # revert
+                    board.revert()
+                elif event.key == pg.K_s:  # score
+                    logger.info(
+                        "Current score of %s: %d",
+                        Player.BLACK,
+                        board.score(Player.BLACK),
+                    )
+                    logger.info(
+                        "Current score of %s: %d",
+                        Player.WHITE,
+                        board.score(Player.WHITE),
+                    )
+            case EventType(type=pg.QUIT):
+                done = True
+            case EventType(type=pg.WINDOWEXPOSED):
+                pg.display.flip()
+            case EventType(type=pg.MOUSEBUTTONDOWN):
+                mouse_x, mouse_y = pg.mouse.get_pos()
+                x = mouse_x // Board.SQUARE_SIZE
+                y = mouse_y // Board.SQUARE_SIZE
+                logger.debug(f"{board.player} on row:{y} and column:{x}")
+                board.update(column=x, row=y)
     pg.quit()
     logger.info("Score of %s: %d", Player.BLACK, board.score(Player.BLACK))
     logger.info("Score of %s: %d", Player.WHITE, board.score(Player.WHITE))